@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Time-aware analytics benchmark
+
+Compares the integer `bucket` groupby from benchmark_pipelines.py with the
+Datetime-based operations in src/pipelines/analytics.py:
+- bucket groupby (timestamp // 1) vs group_by_dynamic("1s")
+- 1 s trailing rolling mean
+- resample with gap filling
+- as-of join between two sensors
+
+Usage:
+    python benchmark_analytics.py               # 1M and 10M rows
+    python benchmark_analytics.py 100000000     # 100M rows (needs ~16 GB RAM)
+"""
+
+import sys
+
+import numpy as np
+import polars as pl
+
+from benchmark_pipelines import N_RUNS, measure, print_table, synthetic_chunk
+from src.pipelines import analytics
+from src.pipelines.schema import CHANNELS
+
+ROW_COUNTS = [1_000_000, 10_000_000]
+
+
+def make_frame(n_rows: int, period_s=0.01, seed=0) -> pl.DataFrame:
+    """Synthetic log shaped like generate_synthetic_csv (float seconds, 100 Hz)."""
+    return synthetic_chunk(n_rows, period_s=period_s, rng=np.random.default_rng(seed))
+
+
+def benchmark_rows(n_rows: int):
+    results = []
+    label = f"{n_rows / 1e6:g}M"
+    print(f"\n[STEP] {n_rows:,} rows...")
+
+    df = make_frame(n_rows)
+
+    def bucket_groupby():
+        return (
+            df
+            .with_columns((pl.col("timestamp") // 1).cast(pl.Int64).alias("bucket"))
+            .group_by("bucket")
+            .agg([pl.col(c).mean() for c in CHANNELS])
+        )
+
+    r, df_t = measure(f"with_time_{label}", "polars", analytics.with_time, df)
+    results.append(r)
+
+    # Second sensor at a slightly different rate/phase for the as-of join
+    other = analytics.with_time(
+        make_frame(n_rows // 2, period_s=0.02, seed=1)
+        .with_columns(pl.col("timestamp") + 0.003)
+        .select(["timestamp", "gyro_z"])
+    )
+
+    for _ in range(N_RUNS):
+        r, _ = measure(f"bucket_1s_{label}", "polars", bucket_groupby)
+        results.append(r)
+
+        r, _ = measure(
+            f"dynamic_1s_{label}", "polars",
+            lambda: df_t.group_by_dynamic("time", every="1s").agg(
+                [pl.col(c).mean() for c in CHANNELS]
+            ),
+        )
+        results.append(r)
+
+        r, _ = measure(
+            f"rolling_1s_{label}", "polars",
+            analytics.rolling_stats, df_t, "1s", CHANNELS, ("mean",),
+        )
+        results.append(r)
+
+        r, _ = measure(
+            f"resample_1s_{label}", "polars",
+            analytics.resample, df_t, "1s", CHANNELS, ("mean",), "forward",
+        )
+        results.append(r)
+
+        r, _ = measure(
+            f"asof_join_{label}", "polars",
+            analytics.asof_join, df_t, other.drop("timestamp"), "10ms",
+        )
+        results.append(r)
+
+    return results
+
+
+if __name__ == "__main__":
+    print("=== Time-aware Analytics Benchmarks ===")
+    row_counts = [int(a) for a in sys.argv[1:]] or ROW_COUNTS
+
+    res = []
+    for n in row_counts:
+        res += benchmark_rows(n)
+
+    print("\n=== Raw Samples ===")
+    print_table(res)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Sensor codec benchmark: compression ratio and encode/decode MB/s
+
+Compares src/pipelines/codec.py ("xor" lossless, "quant" fixed-point)
+with Parquet + zstd on:
+- the synthetic CSV from benchmark_pipelines.generate_synthetic_csv
+- real logs in data/parquet/ (if present)
+
+MB/s is measured against the raw in-memory size (8 bytes per value).
+"""
+
+import glob
+import io
+import time
+
+import polars as pl
+
+from benchmark_pipelines import DATA_CSV, N_ROWS_SYNTHETIC, generate_synthetic_csv
+from src.pipelines.codec import decode_frame, encode_frame
+
+N_RUNS = 3
+
+
+def raw_bytes(df: pl.DataFrame) -> int:
+    return df.height * df.width * 8
+
+
+def best_of(fn, *args):
+    best, out = None, None
+    for _ in range(N_RUNS):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+def parquet_encode(df):
+    buf = io.BytesIO()
+    df.write_parquet(buf, compression="zstd")
+    return buf.getvalue()
+
+
+def parquet_decode(blob):
+    return pl.read_parquet(io.BytesIO(blob))
+
+
+def bench_dataset(label: str, df: pl.DataFrame):
+    raw_mb = raw_bytes(df) / 1024 ** 2
+    print(f"\n[{label}] {df.height:,} rows x {df.width} cols ({raw_mb:.1f} MB raw)")
+    print(f"{'codec':<14} {'ratio':>7} {'enc MB/s':>10} {'dec MB/s':>10}")
+    print("-" * 44)
+
+    codecs = [
+        ("parquet+zstd", parquet_encode, parquet_decode),
+        ("xor", lambda d: encode_frame(d, mode="xor"), decode_frame),
+        ("quant", lambda d: encode_frame(d, mode="quant"), decode_frame),
+    ]
+    for name, enc, dec in codecs:
+        t_enc, blob = best_of(enc, df)
+        t_dec, _ = best_of(dec, blob)
+        print(
+            f"{name:<14} {raw_bytes(df) / len(blob):>6.2f}x "
+            f"{raw_mb / t_enc:>10.1f} {raw_mb / t_dec:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    print("=== Sensor Codec Benchmarks ===")
+
+    if not DATA_CSV.exists():
+        generate_synthetic_csv(DATA_CSV, N_ROWS_SYNTHETIC)
+    bench_dataset("synthetic", pl.read_csv(DATA_CSV))
+
+    files = sorted(glob.glob("data/parquet/*.parquet"))
+    if files:
+        real = pl.concat([pl.read_parquet(f) for f in files], how="diagonal_relaxed")
+        # codec frames are numeric + timestamp only
+        real = real.select([
+            c for c in real.columns
+            if c == "timestamp" or real[c].dtype.is_numeric()
+        ])
+        bench_dataset("real logs", real)
+    else:
+        print("\n[INFO] No logs in data/parquet/ – skipping real-data run.")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Tail-read latency: memory-mapped Arrow IPC hot tier vs Parquet
+
+Writes N_CHUNKS logger-sized chunks through ParquetWriter with a HotTier hook,
+then times the dashboard's "last WINDOW_ROWS rows" read from both tiers.
+"""
+
+import glob
+import shutil
+import time
+from pathlib import Path
+from statistics import median
+
+import numpy as np
+import polars as pl
+
+from benchmark_pipelines import synthetic_chunk
+from src.pipelines.hot_tier import HotTier
+from src.pipelines.parquet_writer import ParquetWriter
+
+BENCH_DIR = Path("data/bench_hot")
+N_CHUNKS = 50
+CHUNK_ROWS = 200
+WINDOW_ROWS = 200 * 5        # 5 chunks, like MAX_FILES_TO_READ in live_dashboard.py
+N_READS = 200
+
+
+def parquet_tail(directory, n_rows, n_files):
+    files = sorted(glob.glob(f"{directory}/*.parquet"))[-n_files:]
+    return pl.concat([pl.read_parquet(f) for f in files]).tail(n_rows)
+
+
+def time_reads(fn, *args):
+    samples = []
+    for _ in range(N_READS):
+        t0 = time.perf_counter()
+        df = fn(*args)
+        samples.append(time.perf_counter() - t0)
+    assert df.height == WINDOW_ROWS
+    return median(samples)
+
+
+if __name__ == "__main__":
+    print("=== Hot Tier Tail-Read Benchmarks ===")
+    shutil.rmtree(BENCH_DIR, ignore_errors=True)
+
+    hot = HotTier(root=str(BENCH_DIR / "hot"), retain_s=3600)
+    writer = ParquetWriter(output_dir=str(BENCH_DIR / "parquet"), hooks=[hot.on_chunk])
+    rng = np.random.default_rng(0)
+    for i in range(N_CHUNKS):
+        writer.write_chunk(synthetic_chunk(CHUNK_ROWS, start_row=i * CHUNK_ROWS, rng=rng))
+        time.sleep(0.001)  # distinct chunk names
+
+    t_parquet = time_reads(parquet_tail, writer.output_dir, WINDOW_ROWS, WINDOW_ROWS // CHUNK_ROWS)
+    t_hot = time_reads(hot.read_latest, WINDOW_ROWS)
+
+    print(f"\nTail read of {WINDOW_ROWS} rows (median of {N_READS}):")
+    print(f"{'parquet':<10} {t_parquet * 1e3:>8.3f} ms")
+    print(f"{'hot (ipc)':<10} {t_hot * 1e3:>8.3f} ms   ({t_parquet / t_hot:.1f}x)")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Orientation filter throughput (samples/s)
+
+- complementary_batch: vectorized NumPy, offline reprocessing path
+- ComplementaryFilter.update: per-sample, streaming path
+- Madgwick.update: per-sample 6-DoF Madgwick
+
+The sensor runs at 20-50 Hz, so anything above ~1 kHz leaves the Pi idle.
+"""
+
+import time
+
+import numpy as np
+
+from src.pipelines.orientation import ComplementaryFilter, Madgwick, complementary_batch
+
+N_BATCH = 1_000_000
+N_STREAM = 100_000
+
+
+def make_samples(n, seed=0):
+    rng = np.random.default_rng(seed)
+    t = 1_672_531_200.0 + np.arange(n) * 0.02
+    accel = [rng.normal(0, 0.3, n), rng.normal(0, 0.3, n), rng.normal(9.81, 0.3, n)]
+    gyro = [rng.normal(0, 2.0, n) for _ in range(3)]
+    return t, accel, gyro
+
+
+def rate(label, n, seconds):
+    print(f"{label:<28} {n / seconds:>14,.0f} samples/s")
+
+
+if __name__ == "__main__":
+    print("=== Orientation Filter Benchmarks ===")
+
+    t, (ax, ay, az), (gx, gy, gz) = make_samples(N_BATCH)
+    t0 = time.perf_counter()
+    complementary_batch(t, ax, ay, az, gx, gy, gz)
+    rate("complementary (batch)", N_BATCH, time.perf_counter() - t0)
+
+    rows = list(zip(*(a[:N_STREAM].tolist() for a in (t, ax, ay, az, gx, gy, gz))))
+    for label, filt in [
+        ("complementary (per-sample)", ComplementaryFilter()),
+        ("madgwick (per-sample)", Madgwick()),
+    ]:
+        t0 = time.perf_counter()
+        for row in rows:
+            filt.update(*row)
+        rate(label, N_STREAM, time.perf_counter() - t0)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Parallel multi-file aggregation benchmark
+
+Writes N_FILES logger-sized Parquet chunks (CHUNK_ROWS rows each, like
+logger_v2.py) and times src/pipelines/parallel_agg.aggregate_dir for
+1, 2, 4, ... up to all cores. Run it on the Pi and on an x86 box to compare
+scaling.
+"""
+
+import os
+import platform
+import shutil
+import time
+from pathlib import Path
+
+from benchmark_pipelines import write_synthetic_chunks
+from src.pipelines.parallel_agg import aggregate_dir
+
+CHUNK_DIR = Path("data/bench_chunks")
+N_FILES = 2_000
+CHUNK_ROWS = 200
+N_RUNS = 3
+
+
+def worker_counts():
+    n, out = os.cpu_count() or 1, []
+    w = 1
+    while w < n:
+        out.append(w)
+        w *= 2
+    return out + [n]
+
+
+if __name__ == "__main__":
+    print("=== Parallel Aggregation Benchmarks ===")
+    print(f"Host: {platform.machine()} / {os.cpu_count()} cores")
+
+    shutil.rmtree(CHUNK_DIR, ignore_errors=True)
+    write_synthetic_chunks(CHUNK_DIR, N_FILES, CHUNK_ROWS)
+
+    baseline = None
+    print(f"\n{'workers':>8} | {'time_s':>8} | {'speed-up':>8} | {'files/s':>9}")
+    print("-" * 44)
+    for w in worker_counts():
+        times = []
+        for _ in range(N_RUNS):
+            t0 = time.perf_counter()
+            out = aggregate_dir(CHUNK_DIR, width=1, workers=w)
+            times.append(time.perf_counter() - t0)
+        best = min(times)
+        baseline = baseline or best
+        print(f"{w:>8} | {best:>8.3f} | {baseline / best:>7.2f}x | {N_FILES / best:>9.0f}")
+
+    assert out["count"].sum() == N_FILES * CHUNK_ROWS
+    print("\nDone.")
@@ -19,6 +19,8 @@ from statistics import mean
 import pandas as pd
 import polars as pl
 
+from src.pipelines.schema import CHANNELS
+
 # psutil is optional – if not installed, we skip memory metrics
 try:
     import psutil
@@ -38,6 +40,7 @@ POLARS_PARQUET = DATA_DIR / "sensor_polars.parquet"
 
 N_ROWS_SYNTHETIC = 1_000_000  # rows for synthetic dataset
 N_RUNS = 3                    # how many times to repeat each benchmark
+SYNTHETIC_T0 = 1_672_531_200.0  # 2023-01-01 UTC, start of synthetic timestamps
 
 
 # -----------------------------
@@ -165,6 +168,33 @@ def generate_synthetic_csv(path: Path, n_rows: int):
     print("[INFO] Synthetic CSV generated.")
 
 
+def synthetic_chunk(n_rows: int, start_row=0, period_s=0.05, rng=None, decimals=None):
+    """
+    One logger-shaped frame: float-second timestamps (20 Hz by default)
+    continuing from `start_row`, and N(0, 1) values for every channel.
+    """
+    import numpy as np
+
+    rng = rng if rng is not None else np.random.default_rng(0)
+    data = {"timestamp": SYNTHETIC_T0 + (start_row + np.arange(n_rows)) * period_s}
+    for c in CHANNELS:
+        values = rng.normal(0, 1, n_rows)
+        data[c] = values if decimals is None else np.round(values, decimals)
+    return pl.DataFrame(data)
+
+
+def write_synthetic_chunks(path: Path, n_files: int, rows: int, decimals=None):
+    """Write `n_files` consecutive chunks as path/00000000.parquet, ..."""
+    import numpy as np
+
+    print(f"[INFO] Writing {n_files:,} chunks x {rows} rows to {path}...")
+    path.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(0)
+    for i in range(n_files):
+        df = synthetic_chunk(rows, start_row=i * rows, rng=rng, decimals=decimals)
+        df.write_parquet(path / f"{i:08d}.parquet")
+
+
 # -----------------------------
 # Benchmark routines
 # -----------------------------
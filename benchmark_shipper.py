@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Telemetry uplink benchmark: rows/sec shipped per core
+
+Starts a Collector in a child process on localhost, writes N_CHUNKS
+logger-sized chunks, then drains them with a Shipper in this process.
+Rows per CPU-second of the shipper process is the per-core figure.
+"""
+
+import multiprocessing as mp
+import shutil
+import time
+from pathlib import Path
+
+from benchmark_pipelines import write_synthetic_chunks
+from src.pipelines.shipper import Collector, Shipper
+
+BENCH_DIR = Path("data/bench_ship")
+PORT = 8765
+N_CHUNKS = 500
+CHUNK_ROWS = 200
+
+
+def run_collector(root, port):
+    Collector(root=root).serve(host="127.0.0.1", port=port).serve_forever()
+
+
+if __name__ == "__main__":
+    print("=== Telemetry Uplink Benchmarks ===")
+    shutil.rmtree(BENCH_DIR, ignore_errors=True)
+    # 3 decimals: roughly sensor resolution, so the codecs see realistic bits
+    write_synthetic_chunks(BENCH_DIR / "parquet", N_CHUNKS, CHUNK_ROWS, decimals=3)
+
+    proc = mp.get_context("spawn").Process(
+        target=run_collector, args=(str(BENCH_DIR / "collector"), PORT), daemon=True
+    )
+    proc.start()
+    time.sleep(2.0)  # let the collector bind
+
+    for mode in ("xor", "quant"):
+        shipper = Shipper(
+            f"http://127.0.0.1:{PORT}", f"bench-{mode}",
+            source_dir=str(BENCH_DIR / "parquet"),
+            state_path=str(BENCH_DIR / f"state_{mode}.json"),
+            mode=mode,
+        )
+        # bytes_shipped is a process-wide counter shared by every Shipper
+        bytes0 = shipper.bytes_shipped.value
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        rows = shipper.drain()
+        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+        nbytes = shipper.bytes_shipped.value - bytes0
+        shipper.stop()
+        print(
+            f"{mode:<6} {rows:,} rows  {rows / wall:>12,.0f} rows/s wall  "
+            f"{rows / cpu:>12,.0f} rows/s per core  "
+            f"{nbytes / rows:.1f} B/row"
+        )
+
+    proc.terminate()
@@ -0,0 +1,75 @@
+import asyncio
+import socket
+from datetime import datetime
+
+import numpy as np
+
+from src import metrics
+from src.pipelines.hot_tier import HotTier
+from src.pipelines.orientation import add_orientation
+from src.pipelines.parquet_writer import ParquetWriter
+from src.pipelines.rollups import RollupStore
+from src.pipelines.runtime import Batcher, Pipeline
+from src.pipelines.shipper import Shipper
+from src.pipelines.sketches import SketchStore
+from src.sensors.mpu6050 import MPU6050
+
+
+SAMPLE_RATE = 20           # Hz
+CHUNK_SIZE = 200           # 200 samples per Parquet file
+OUTPUT_DIR = "data/parquet"
+METRICS_PORT = 9108        # http://127.0.0.1:9108/metrics
+SHIP_URL = None            # e.g. "http://collector:8600" to upload chunks
+STATS_EVERY_S = 30         # per-stage throughput line
+
+
+def main():
+    """
+    logger_v2.py as one asyncio process: sensor -> Parquet (+ hot tier,
+    rollups, sketches, shipping) with a 1 s feature stage alongside.
+    """
+    sensor = MPU6050()
+    hooks = [
+        HotTier().on_chunk,
+        RollupStore().on_chunk,
+        SketchStore().on_chunk,
+    ]
+    if SHIP_URL:
+        hooks.append(Shipper(SHIP_URL, socket.gethostname(), source_dir=OUTPUT_DIR).start().on_chunk)
+    writer = ParquetWriter(output_dir=OUTPUT_DIR, chunk_size=CHUNK_SIZE, hooks=hooks)
+
+    def read():
+        return {"timestamp": datetime.utcnow().isoformat(), **sensor.read()}
+
+    orientation_state = None
+
+    def orient(df):
+        nonlocal orientation_state
+        df, orientation_state = add_orientation(df, state=orientation_state)
+        return df
+
+    rms_hist = metrics.histogram("accel_rms", buckets=(1, 2, 5, 10, 20, 50))
+
+    def features(df):
+        mag = np.sqrt(df["accel_x"] ** 2 + df["accel_y"] ** 2 + df["accel_z"] ** 2)
+        rms_hist.observe(float(np.sqrt(np.mean(mag.to_numpy() ** 2))))
+
+    pipe = Pipeline()
+    rows = pipe.source("imu", read, rate_hz=SAMPLE_RATE, blocking=True)
+
+    chunks = pipe.stage("chunk", Batcher(CHUNK_SIZE), rows)
+    oriented = pipe.stage("orientation", orient, chunks)
+    pipe.sink("parquet", writer.write_chunk, oriented, blocking=True)
+
+    # Feature consumer only needs recent data: drop whole windows rather than
+    # stall the sensor (dropping rows before the Batcher would tear windows)
+    windows = pipe.stage("window_1s", Batcher(SAMPLE_RATE), rows)
+    pipe.sink("features", features, windows, overflow="drop")
+
+    metrics.serve(METRICS_PORT)
+    print(f"Logging at {SAMPLE_RATE} Hz (Ctrl+C flushes and exits)...")
+    asyncio.run(pipe.run(report_every_s=STATS_EVERY_S))
+
+
+if __name__ == "__main__":
+    main()
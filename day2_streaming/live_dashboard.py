@@ -6,16 +6,36 @@ from dash.dependencies import Input, Output
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from src import metrics
+from src.pipelines.hot_tier import HotTier
+
 # --- TUNABLES ----------------------------------------------------
 SAMPLE_RATE_HZ = 20          # match logger_v2.py
 WINDOW_SECONDS = 10          # show last N seconds
 MAX_FILES_TO_READ = 5        # safety so we don't read entire history
 REFRESH_MS = 200             # dashboard refresh interval (200 ms = 5 FPS)
+METRICS_PORT = 9109          # http://127.0.0.1:9109/metrics
+HOT_DIR = "data/hot"         # Arrow IPC mirror of recent chunks (logger_v2.py)
 # -----------------------------------------------------------------
 
+hot_tier = HotTier(root=HOT_DIR, readonly=True)
+
 
+@metrics.timed("load_latest_window")
 def load_latest_window():
-    """Load the last WINDOW_SECONDS of data from the newest Parquet files."""
+    """
+    Load the last WINDOW_SECONDS of data: from the hot tier when the logger
+    maintains one, otherwise from the newest Parquet files.
+    """
+    # How many samples to keep for the rolling window
+    window_samples = int(SAMPLE_RATE_HZ * WINDOW_SECONDS)
+
+    # Memory-mapped hot tier first; fall back to Parquet if the logger
+    # isn't maintaining one (or it has expired)
+    df = hot_tier.read_latest(window_samples)
+    if not df.is_empty():
+        return df
+
     files = sorted(glob.glob("data/parquet/*.parquet"))
     if not files:
         return pl.DataFrame()
@@ -35,8 +55,6 @@ def load_latest_window():
 
     df = pl.concat(df_list)
 
-    # How many samples to keep for the rolling window
-    window_samples = int(SAMPLE_RATE_HZ * WINDOW_SECONDS)
     if df.height > window_samples:
         df = df.tail(window_samples)
 
@@ -59,6 +77,7 @@ app.layout = html.Div(
     Output("live-graph", "figure"),
     Input("timer", "n_intervals"),
 )
+@metrics.timed("build_figure")
 def update_graph(n):
     df = load_latest_window()
     if df.is_empty():
@@ -130,5 +149,7 @@ def update_graph(n):
 
 
 if __name__ == "__main__":
+    metrics.serve(METRICS_PORT)
+    metrics.install_profiler_signal()
     # host=0.0.0.0 so you can view from your laptop
     app.run(host="0.0.0.0", port=8050)
\ No newline at end of file
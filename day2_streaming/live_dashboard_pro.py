@@ -9,6 +9,8 @@ from plotly.subplots import make_subplots
 from dash import Dash, dcc, html
 from dash.dependencies import Input, Output
 
+from src import metrics
+from src.pipelines.orientation import ComplementaryFilter
 from src.sensors.mpu6050 import MPU6050
 
 # ---- CONFIG -----------------------------------------------------
@@ -17,6 +19,7 @@ SAMPLE_RATE_HZ = 50
 WINDOW_SECONDS = 10
 BUFFER_LEN = SAMPLE_RATE_HZ * WINDOW_SECONDS
 REFRESH_MS = 200  # 5 FPS
+METRICS_PORT = 9110  # http://127.0.0.1:9110/metrics
 
 buffer = deque(maxlen=BUFFER_LEN)
 
@@ -25,15 +28,17 @@ buffer = deque(maxlen=BUFFER_LEN)
 
 def sensor_loop():
     sensor = MPU6050()
+    fusion = ComplementaryFilter()
     period = 1.0 / SAMPLE_RATE_HZ
+    append_timer = metrics.timer("buffer_append", sample_every=10)
     print(f"[INFO] Starting sensor loop at {SAMPLE_RATE_HZ} Hz")
 
     while True:
         sample = sensor.read()
         sample["t"] = time.time()
-        buffer.append(sample)
-        # debug: show that sensor is alive
-        print("[SENSOR]", sample)
+        fusion.update_sample(sample, sample["t"])
+        with append_timer:
+            buffer.append(sample)
         time.sleep(period)
 
 
@@ -72,13 +77,10 @@ def compute_kpis(ax, ay, az, gx, gy, gz, temp):
     return rms_accel, peak_gyro, mean_temp, state
 
 
-def latest_pitch_roll(ax, ay, az):
-    # Use last sample
-    gax, gay, gaz = ax[-1] / 9.81, ay[-1] / 9.81, az[-1] / 9.81
-    roll = math.atan2(gay, gaz)
-    pitch = math.atan2(-gax, math.sqrt(gay**2 + gaz**2))
-    # exaggerate slightly
-    return pitch * 1.5, roll * 1.5
+def latest_pitch_roll():
+    # Fused accel + gyro orientation from the sensor thread (degrees)
+    last = buffer[-1]
+    return math.radians(last["pitch"]), math.radians(last["roll"])
 
 
 def make_cube(pitch, roll):
@@ -201,6 +203,7 @@ app.layout = html.Div(
     ],
     Input("timer", "n_intervals"),
 )
+@metrics.timed("build_figure")
 def update(n):
     arrays = buffer_to_arrays()
     if arrays is None:
@@ -212,9 +215,6 @@ def update(n):
     t, ax, ay, az, gx, gy, gz, temp = arrays
     t_rel = t - t[0]
 
-    # debug: show callback is running
-    print("[DASH]", n, "samples:", len(t))
-
     fig = make_subplots(
         rows=3,
         cols=1,
@@ -246,7 +246,7 @@ def update(n):
     fig.update_xaxes(title_text="Time (s, last 10s)", row=3, col=1)
 
     rms_accel, peak_gyro, mean_temp, state = compute_kpis(ax, ay, az, gx, gy, gz, temp)
-    pitch, roll = latest_pitch_roll(ax, ay, az)
+    pitch, roll = latest_pitch_roll()
     cube_fig = make_cube(pitch, roll)
 
     return (
@@ -260,4 +260,6 @@ def update(n):
 
 
 if __name__ == "__main__":
+    metrics.serve(METRICS_PORT)
+    metrics.install_profiler_signal()
     app.run(host="0.0.0.0", port=8051)
\ No newline at end of file
@@ -1,20 +1,50 @@
+import socket
 import time
 import polars as pl
 from datetime import datetime
 
+from src import metrics
 from src.sensors.mpu6050 import MPU6050
+from src.pipelines.hot_tier import HotTier
+from src.pipelines.orientation import add_orientation
 from src.pipelines.parquet_writer import ParquetWriter
+from src.pipelines.rollups import RollupStore
+from src.pipelines.shipper import Shipper
+from src.pipelines.sketches import SketchStore
 
 
 SAMPLE_RATE = 20           # Hz
 CHUNK_SIZE = 200           # 200 samples per Parquet file
 OUTPUT_DIR = "data/parquet"
+ROLLUP_DIR = "data/rollups"  # 1s / 1m / 1h aggregates, updated per chunk
+SKETCH_DIR = "data/sketches" # per-chunk quantile sketches + histograms
+HOT_DIR = "data/hot"         # Arrow IPC copy of the last HOT_RETAIN_S seconds
+HOT_RETAIN_S = 300
+METRICS_PORT = 9108          # http://127.0.0.1:9108/metrics
+SHIP_URL = None              # e.g. "http://collector:8600" to upload chunks
+NODE_ID = socket.gethostname()
 
 def main():
     sensor = MPU6050()
-    writer = ParquetWriter(output_dir=OUTPUT_DIR, chunk_size=CHUNK_SIZE)
+    rollups = RollupStore(root=ROLLUP_DIR)
+    sketches = SketchStore(root=SKETCH_DIR)
+    hot = HotTier(root=HOT_DIR, retain_s=HOT_RETAIN_S)
+    hooks = [hot.on_chunk, rollups.on_chunk, sketches.on_chunk]
+    if SHIP_URL:
+        shipper = Shipper(SHIP_URL, NODE_ID, source_dir=OUTPUT_DIR).start()
+        hooks.append(shipper.on_chunk)
+    writer = ParquetWriter(
+        output_dir=OUTPUT_DIR,
+        chunk_size=CHUNK_SIZE,
+        hooks=hooks,
+    )
+
+    metrics.serve(METRICS_PORT)
+    metrics.install_profiler_signal()  # kill -USR1 <pid> to start/stop
+    append_timer = metrics.timer("buffer_append", sample_every=10)
 
     buffer = []
+    orientation_state = None  # carried across chunks by add_orientation
     period = 1.0 / SAMPLE_RATE
 
     print(f"Logging at {SAMPLE_RATE} Hz...")
@@ -23,13 +53,15 @@ def main():
         ts = datetime.utcnow().isoformat()
         reading = sensor.read()
 
-        buffer.append({
-            "timestamp": ts,
-            **reading
-        })
+        with append_timer:
+            buffer.append({
+                "timestamp": ts,
+                **reading
+            })
 
         if len(buffer) >= CHUNK_SIZE:
             df = pl.DataFrame(buffer)
+            df, orientation_state = add_orientation(df, state=orientation_state)
             writer.write_chunk(df)
             buffer = []
 
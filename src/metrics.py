@@ -0,0 +1,282 @@
+"""
+Lightweight in-process metrics + opt-in sampling profiler.
+
+- counters / histograms in a global registry (thread-safe, no deps)
+- `timed` decorator and `timer` context manager with call sampling, so hot
+  paths (sensor.read at 50 Hz, buffer appends) only pay for perf_counter on
+  every Nth call
+- `serve()` exposes /metrics (Prometheus text) and /metrics.json on a local
+  port; `start_json_dump()` writes the same snapshot to a file periodically
+- `install_profiler_signal()`: `kill -USR1 <pid>` starts a stack-sampling
+  profiler, a second USR1 stops it and writes collapsed stacks (flamegraph /
+  speedscope format) to data/profiles/
+"""
+
+import bisect
+import functools
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter as _StackCounter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency buckets (seconds): 100 µs ... 10 s
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0,
+)
+
+
+class Counter:
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        with self._lock:
+            self.value += n
+            return self.value
+
+
+class Histogram:
+    def __init__(self, name, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot = +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name):
+        with self._lock:
+            return self.counters.setdefault(name, Counter(name))
+
+    def histogram(self, name, buckets=DEFAULT_BUCKETS):
+        with self._lock:
+            return self.histograms.setdefault(name, Histogram(name, buckets))
+
+    def snapshot(self):
+        out = {"timestamp": time.time(), "counters": {}, "histograms": {}}
+        for name, c in list(self.counters.items()):
+            out["counters"][name] = c.value
+        for name, h in list(self.histograms.items()):
+            out["histograms"][name] = {
+                "count": h.count,
+                "sum": h.sum,
+                "mean": h.sum / h.count if h.count else None,
+                "buckets": dict(zip([*map(str, h.bounds), "+Inf"], h.counts)),
+            }
+        return out
+
+    def prometheus_text(self):
+        lines = []
+        for name, c in sorted(self.counters.items()):
+            lines += [f"# TYPE {name} counter", f"{name} {c.value}"]
+        for name, h in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            cum = 0
+            for bound, n in zip([*map(str, h.bounds), "+Inf"], h.counts):
+                cum += n
+                lines.append(f'{name}_bucket{{le="{bound}"}} {cum}')
+            lines += [f"{name}_sum {h.sum}", f"{name}_count {h.count}"]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name):
+    return REGISTRY.counter(name)
+
+
+def histogram(name, buckets=DEFAULT_BUCKETS):
+    return REGISTRY.histogram(name, buckets)
+
+
+# -----------------------------
+# Timing
+# -----------------------------
+def timed(name, sample_every=1):
+    """
+    Decorator: count every call as `<name>_calls_total` and record the
+    latency of every `sample_every`-th call in `<name>_seconds`.
+    """
+    def deco(fn):
+        calls = counter(f"{name}_calls_total")
+        hist = histogram(f"{name}_seconds")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if calls.inc() % sample_every:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                hist.observe(time.perf_counter() - t0)
+
+        return wrapper
+
+    return deco
+
+
+class timer:
+    """
+    Context-manager form of `timed` for inline blocks. Create it once at
+    module level and reuse it; one instance must not be shared between
+    threads.
+    """
+
+    def __init__(self, name, sample_every=1):
+        self.calls = counter(f"{name}_calls_total")
+        self.hist = histogram(f"{name}_seconds")
+        self.sample_every = sample_every
+        self._t0 = None
+
+    def __enter__(self):
+        if self.calls.inc() % self.sample_every == 0:
+            self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._t0 is not None:
+            self.hist.observe(time.perf_counter() - self._t0)
+            self._t0 = None
+        return False
+
+
+# -----------------------------
+# Exposition
+# -----------------------------
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = self.registry.prometheus_text().encode()
+            ctype = "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body = json.dumps(self.registry.snapshot()).encode()
+            ctype = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # keep scrapes out of stdout
+
+
+def serve(port=9108, host="127.0.0.1"):
+    """Serve /metrics and /metrics.json from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[INFO] Metrics on http://{host}:{port}/metrics")
+    return server
+
+
+def start_json_dump(path="data/metrics.json", interval_s=10.0):
+    """Write a JSON snapshot every `interval_s` seconds from a daemon thread."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def loop():
+        while True:
+            time.sleep(interval_s)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(REGISTRY.snapshot(), f)
+            os.replace(tmp, path)
+
+    threading.Thread(target=loop, daemon=True).start()
+
+
+# -----------------------------
+# Sampling profiler
+# -----------------------------
+class SamplingProfiler:
+    """
+    py-spy style wall-clock sampler: every `interval_s` it grabs the stack of
+    every other thread and counts it. Cost is per sample, not per call, so it
+    is safe to turn on in production.
+    """
+
+    def __init__(self, interval_s=0.005):
+        self.interval_s = interval_s
+        self.stacks = _StackCounter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        self.stacks.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def dump(self, path):
+        """Write collapsed stacks ("a;b;c <count>" per line)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+
+def install_profiler_signal(sig=signal.SIGUSR1, out_dir="data/profiles"):
+    """Toggle a SamplingProfiler with `kill -USR1 <pid>`. Main thread only."""
+    profiler = SamplingProfiler()
+
+    def toggle(signum, frame):
+        if profiler.running:
+            profiler.stop()
+            path = os.path.join(out_dir, time.strftime("%Y%m%d_%H%M%S") + ".folded")
+            profiler.dump(path)
+            print(f"[INFO] Profile written to {path}")
+        else:
+            profiler.start()
+            print("[INFO] Sampling profiler started (send signal again to stop)")
+
+    signal.signal(sig, toggle)
+    return profiler
@@ -0,0 +1,85 @@
+"""
+Time-aware analytics over the logged sensor dataset.
+
+Everything here runs on a sorted Datetime `time` column (derived from
+`timestamp`, whatever format it was logged in) and uses Polars'
+`rolling` / `group_by_dynamic` / `join_asof` instead of the integer
+`timestamp // 1` buckets used in benchmark_pipelines.py, so windows can be
+any duration ("250ms", "5s", "1m") and gaps in the log are visible.
+"""
+
+import polars as pl
+
+from src.pipelines.schema import CHANNELS, timestamp_datetime
+
+
+def with_time(df):
+    """Add a sorted Datetime `time` column (works on DataFrame and LazyFrame)."""
+    return df.with_columns(timestamp_datetime(df).alias("time")).sort("time")
+
+
+def load_dataset(source="data/parquet/*.parquet"):
+    """Lazily scan the logged chunks with a sorted `time` column."""
+    return with_time(pl.scan_parquet(source))
+
+
+def _channels(df, channels):
+    names = df.collect_schema().names()
+    return [c for c in (channels or CHANNELS) if c in names]
+
+
+def _stat_aggs(channels, stats):
+    return [
+        getattr(pl.col(c), stat)().alias(f"{c}_{stat}")
+        for c in channels
+        for stat in stats
+    ]
+
+
+def rolling_stats(df, window="1s", channels=None, stats=("mean", "std")):
+    """Trailing time window per sample, e.g. a 1 s moving mean/std."""
+    channels = _channels(df, channels)
+    return df.rolling(index_column="time", period=window).agg(
+        _stat_aggs(channels, stats)
+    )
+
+
+def resample(df, every="1s", channels=None, stats=("mean",), fill="null"):
+    """
+    Downsample to fixed `every` buckets, inserting rows for empty buckets.
+
+    fill:
+        "null"        leave gaps as nulls (default, gaps stay visible)
+        "forward"     carry the last value forward
+        "interpolate" linear interpolation between neighbours
+    """
+    channels = _channels(df, channels)
+    out = df.group_by_dynamic("time", every=every).agg(
+        [pl.len().alias("count"), *_stat_aggs(channels, stats)]
+    )
+    if isinstance(out, pl.LazyFrame):
+        out = out.collect()
+
+    out = out.upsample(time_column="time", every=every).with_columns(
+        pl.col("count").fill_null(0)
+    )
+    value_cols = [c for c in out.columns if c not in ("time", "count")]
+    if fill == "forward":
+        out = out.with_columns(pl.col(value_cols).forward_fill())
+    elif fill == "interpolate":
+        out = out.with_columns(pl.col(value_cols).interpolate())
+    elif fill != "null":
+        raise ValueError(f"Unknown fill strategy: {fill!r}")
+    return out
+
+
+def asof_join(left, right, tolerance="50ms", strategy="nearest", suffix="_right"):
+    """
+    Align two sensors' samples on `time` without requiring equal clocks.
+
+    Each left row gets the right row closest in time (within `tolerance`);
+    unmatched rows keep nulls.
+    """
+    return left.join_asof(
+        right, on="time", strategy=strategy, tolerance=tolerance, suffix=suffix
+    )
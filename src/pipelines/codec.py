@@ -0,0 +1,195 @@
+"""
+Time-series codecs for archival / transport of sensor frames.
+
+- timestamp: int64 microseconds, delta-of-delta. Regular sampling makes
+  nearly every value 0 or a small jitter.
+- floats, "xor": Gorilla-style XOR against the previous value's bits
+  (lossless). Instead of Gorilla's per-value bit packing, which cannot be
+  vectorized, the XOR residuals are byte-shuffled (all byte 0s, then all
+  byte 1s, ...) so their runs of zero bytes line up for the entropy stage.
+- floats, "quant": fixed-point at a per-channel resolution (lossy, error
+  <= scale / 2), delta-encoded, zigzagged and packed into the narrowest of
+  1/2/4/8 bytes. Columns containing NaN fall back to "xor".
+
+Every stage is NumPy-vectorized; zlib is the final entropy coder.
+
+Frame layout: b"IMUC" | u32 header length | JSON header | column blobs.
+"""
+
+import json
+import struct
+import zlib
+
+import numpy as np
+import polars as pl
+
+from src.pipelines.schema import timestamp_datetime
+
+MAGIC = b"IMUC"
+ZLIB_LEVEL = 1  # level 6 buys ~2% ratio for ~2x encode time
+
+# Fixed-point resolution per channel for mode="quant"
+QUANT_SCALE = {
+    "accel_x": 1e-3,  # m/s²  (MPU6050 ±2 g LSB ≈ 6e-4)
+    "accel_y": 1e-3,
+    "accel_z": 1e-3,
+    "gyro_x": 1e-2,   # °/s   (±250 °/s LSB ≈ 7.6e-3)
+    "gyro_y": 1e-2,
+    "gyro_z": 1e-2,
+    "temp_c": 1e-2,   # °C
+}
+DEFAULT_SCALE = 1e-3
+
+
+# -----------------------------
+# Vectorized primitives
+# -----------------------------
+def zigzag(x):
+    x = x.astype(np.int64)
+    return ((x << 1) ^ (x >> 63)).view(np.uint64)
+
+
+def unzigzag(u):
+    u = u.astype(np.uint64)
+    return (u >> np.uint64(1)).view(np.int64) ^ -(u & np.uint64(1)).view(np.int64)
+
+
+def _pack(u):
+    """Narrowest unsigned width (bytes) that holds every value."""
+    top = int(u.max()) if u.size else 0
+    for width, dtype in ((1, np.uint8), (2, np.uint16), (4, np.uint32)):
+        if top < 1 << (8 * width):
+            return width, u.astype(dtype)
+    return 8, u.astype(np.uint64)
+
+
+def _shuffle(arr):
+    """Byte-plane transpose: byte k of every value stored contiguously."""
+    width = arr.dtype.itemsize
+    return arr.view(np.uint8).reshape(-1, width).T.tobytes()
+
+
+def _unshuffle(buf, dtype, n):
+    width = np.dtype(dtype).itemsize
+    planes = np.frombuffer(buf, dtype=np.uint8).reshape(width, n)
+    return np.ascontiguousarray(planes.T).view(dtype).reshape(n)
+
+
+_UINTS = {1: np.uint8, 2: np.uint16, 4: np.uint32, 8: np.uint64}
+
+
+# -----------------------------
+# Column codecs
+# -----------------------------
+def _encode_timestamps(us):
+    meta = {"codec": "dod", "n": int(us.size)}
+    if us.size:
+        meta["t0"] = int(us[0])
+    if us.size > 1:
+        deltas = np.diff(us)
+        meta["d0"] = int(deltas[0])
+        width, packed = _pack(zigzag(np.diff(deltas)))
+        meta["width"] = width
+        return meta, zlib.compress(_shuffle(packed), ZLIB_LEVEL)
+    return meta, b""
+
+
+def _decode_timestamps(meta, blob):
+    n = meta["n"]
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    if n == 1:
+        return np.array([meta["t0"]], dtype=np.int64)
+    dod = unzigzag(_unshuffle(zlib.decompress(blob), _UINTS[meta["width"]], n - 2))
+    deltas = meta["d0"] + np.concatenate([[0], np.cumsum(dod)])
+    return meta["t0"] + np.concatenate([[0], np.cumsum(deltas)])
+
+
+def _encode_xor(values):
+    bits = values.astype(np.float64).view(np.uint64)
+    xored = bits ^ np.concatenate([[np.uint64(0)], bits[:-1]])
+    return {"codec": "xor", "n": int(values.size)}, zlib.compress(_shuffle(xored), ZLIB_LEVEL)
+
+
+def _decode_xor(meta, blob):
+    xored = _unshuffle(zlib.decompress(blob), np.uint64, meta["n"])
+    return np.bitwise_xor.accumulate(xored).view(np.float64)
+
+
+def _encode_quant(values, scale):
+    q = np.round(values / scale).astype(np.int64)
+    width, packed = _pack(zigzag(np.diff(q, prepend=0)))
+    meta = {"codec": "quant", "n": int(values.size), "scale": scale, "width": width}
+    return meta, zlib.compress(_shuffle(packed), ZLIB_LEVEL)
+
+
+def _decode_quant(meta, blob):
+    packed = _unshuffle(zlib.decompress(blob), _UINTS[meta["width"]], meta["n"])
+    return np.cumsum(unzigzag(packed)) * meta["scale"]
+
+
+# -----------------------------
+# Frames
+# -----------------------------
+def encode_frame(df: pl.DataFrame, mode="xor", scales=None):
+    """
+    Encode a sensor frame to bytes.
+
+    mode: "xor" (lossless) or "quant" (fixed-point, see QUANT_SCALE).
+    The `timestamp` column (any logged format) is stored as microseconds and
+    decodes to a Datetime column.
+    """
+    if mode not in ("xor", "quant"):
+        raise ValueError(f"Unknown codec mode: {mode!r}")
+    scales = {**QUANT_SCALE, **(scales or {})}
+
+    columns, blobs = [], []
+    for name in df.columns:
+        if name == "timestamp":
+            us = df.select(timestamp_datetime(df).dt.epoch("us")).to_series().to_numpy()
+            meta, blob = _encode_timestamps(us)
+        elif df[name].dtype.is_numeric():
+            values = df[name].cast(pl.Float64).to_numpy()
+            if mode == "quant" and not np.isnan(values).any():
+                meta, blob = _encode_quant(values, scales.get(name, DEFAULT_SCALE))
+            else:
+                meta, blob = _encode_xor(values)
+        else:
+            raise ValueError(f"Column {name!r} ({df[name].dtype}) is not encodable")
+        meta["name"] = name
+        meta["length"] = len(blob)
+        columns.append(meta)
+        blobs.append(blob)
+
+    header = json.dumps({"columns": columns}).encode()
+    return b"".join([MAGIC, struct.pack("<I", len(header)), header, *blobs])
+
+
+def decode_frame(buf) -> pl.DataFrame:
+    """Inverse of encode_frame. Raises ValueError on any malformed input."""
+    if buf[:4] != MAGIC:
+        raise ValueError("Not an encoded sensor frame")
+    try:
+        return _decode_columns(buf)
+    except (struct.error, zlib.error, KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Corrupt sensor frame: {e!r}") from e
+
+
+def _decode_columns(buf) -> pl.DataFrame:
+    (hlen,) = struct.unpack("<I", buf[4:8])
+    header = json.loads(buf[8:8 + hlen])
+    pos = 8 + hlen
+
+    series = []
+    for meta in header["columns"]:
+        blob = buf[pos:pos + meta["length"]]
+        pos += meta["length"]
+        if meta["codec"] == "dod":
+            us = _decode_timestamps(meta, blob)
+            series.append(pl.Series(meta["name"], us).cast(pl.Datetime("us")))
+        elif meta["codec"] == "xor":
+            # nulls travel as NaN; hand them back as nulls
+            series.append(pl.Series(meta["name"], _decode_xor(meta, blob)).fill_nan(None))
+        else:
+            series.append(pl.Series(meta["name"], _decode_quant(meta, blob)))
+    return pl.DataFrame(series)
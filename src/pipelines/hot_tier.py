@@ -0,0 +1,62 @@
+"""
+Memory-mapped Arrow IPC hot tier for the most recent data.
+
+Every closed chunk is also written as an uncompressed Arrow IPC (Feather v2)
+file in data/hot/. Readers memory-map those files, so the dashboard's
+"last N seconds" read is a page-cache lookup instead of a Parquet
+decompress + decode. Segments older than `retain_s` are deleted: the
+compressed Parquet copy written by ParquetWriter is the cold tier.
+"""
+
+import glob
+import os
+import time
+
+import polars as pl
+
+
+class HotTier:
+    def __init__(self, root="data/hot", retain_s=300, readonly=False):
+        self.root = root
+        self.retain_s = retain_s
+        # Readers (dashboards) must not create the directory as a side effect;
+        # a missing root just reads as empty.
+        if not readonly:
+            os.makedirs(root, exist_ok=True)
+
+    def on_chunk(self, df: pl.DataFrame, path):
+        """ParquetWriter hook: mirror the chunk as IPC and expire old segments."""
+        name = os.path.splitext(os.path.basename(path))[0] + ".arrow"
+        out = os.path.join(self.root, name)
+        tmp = out + ".tmp"
+        df.write_ipc(tmp, compression="uncompressed")
+        os.replace(tmp, out)
+        self.expire()
+
+    def files(self):
+        return sorted(glob.glob(os.path.join(self.root, "*.arrow")))
+
+    def expire(self, now=None):
+        cutoff = (now or time.time()) - self.retain_s
+        for f in self.files():
+            try:
+                if os.path.getmtime(f) < cutoff:
+                    os.remove(f)
+            except FileNotFoundError:
+                pass  # raced with another expire()
+
+    def read_latest(self, n_rows):
+        """Last `n_rows` rows across the newest segments (zero-copy reads)."""
+        frames, have = [], 0
+        for f in reversed(self.files()):
+            try:
+                df = pl.read_ipc(f)  # memory-mapped by default
+            except (FileNotFoundError, OSError):
+                continue  # expired between listing and opening
+            frames.append(df)
+            have += df.height
+            if have >= n_rows:
+                break
+        if not frames:
+            return pl.DataFrame()
+        return pl.concat(frames[::-1], rechunk=False).tail(n_rows)
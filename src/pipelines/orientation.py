@@ -0,0 +1,255 @@
+"""
+Orientation estimation (accelerometer + gyro fusion) as a pipeline stage.
+
+Complementary filter on roll/pitch, gyro-integrated yaw:
+
+    angle_k = alpha * (angle_{k-1} + gyro_k * dt_k) + (1 - alpha) * accel_angle_k
+
+The recursion is linear, so `complementary_batch` solves it in NumPy blocks
+(no per-sample Python loop) for offline reprocessing of Parquet logs, while
+`ComplementaryFilter.update` is the per-sample form for streaming. Both give
+the same result for the same samples.
+
+`Madgwick` is the per-sample 6-DoF Madgwick filter, for when the
+small-angle gyro coupling of the complementary filter is not good enough.
+
+All three restart from the accelerometer after a gap in the samples
+(logger restart, sensor dropout, clock step): integrating gyro over minutes
+or hours of missing data would start the next chunk far off.
+
+Units follow MPU6050.read(): accel in m/s², gyro in °/s. Output angles are
+degrees; yaw drifts (no magnetometer).
+"""
+
+import math
+import os
+
+import numpy as np
+import polars as pl
+
+from src.pipelines.schema import epoch_seconds
+
+ALPHA = 0.98  # gyro weight; ~1 s time constant at 50 Hz
+ORIENTATION_COLUMNS = ("roll", "pitch", "yaw", "q_w", "q_x", "q_y", "q_z")
+MAX_GAP_S = 1.0  # dt above this (or negative) re-initialises roll/pitch from accel
+
+
+def _is_gap(dt):
+    return (dt < 0.0) | (dt > MAX_GAP_S)
+
+
+def accel_angles(ax, ay, az):
+    """Roll and pitch (rad) from gravity alone. Works on scalars or arrays."""
+    roll = np.arctan2(ay, az)
+    pitch = np.arctan2(-ax, np.sqrt(ay * ay + az * az))
+    return roll, pitch
+
+
+def euler_to_quaternion(roll, pitch, yaw):
+    """ZYX Euler (rad) -> (w, x, y, z). Vectorized."""
+    cr, sr = np.cos(roll / 2), np.sin(roll / 2)
+    cp, sp = np.cos(pitch / 2), np.sin(pitch / 2)
+    cy, sy = np.cos(yaw / 2), np.sin(yaw / 2)
+    return (
+        cr * cp * cy + sr * sp * sy,
+        sr * cp * cy - cr * sp * sy,
+        cr * sp * cy + sr * cp * sy,
+        cr * cp * sy - sr * sp * cy,
+    )
+
+
+def _iir(u, alpha, x0):
+    """x_k = alpha * x_{k-1} + u_k, evaluated block-wise with cumsum."""
+    if alpha >= 1.0:
+        return x0 + np.cumsum(u)
+    # alpha**-block must stay well inside float64 range
+    block = max(1, int(math.log(1e6) / -math.log(alpha))) if alpha > 0 else 1
+    out = np.empty_like(u)
+    x = x0
+    for s in range(0, u.size, block):
+        seg = u[s:s + block]
+        p = alpha ** np.arange(seg.size)
+        out[s:s + block] = p * (alpha * x + np.cumsum(seg / p))
+        x = out[s + seg.size - 1]
+    return out
+
+
+def complementary_batch(t, ax, ay, az, gx, gy, gz, alpha=ALPHA, state=None):
+    """
+    Orientation for a whole batch of samples.
+
+    t: epoch seconds; accel m/s²; gyro °/s. `state` is (roll, pitch, yaw, t)
+    in radians / seconds after the previous batch (None = initialise from
+    the first accel sample), so consecutive chunks can be processed one at a
+    time. After a gap (see MAX_GAP_S) roll/pitch restart from that sample's
+    accel angles; yaw carries on from where it was.
+
+    Returns (roll, pitch, yaw) arrays in radians plus the state for the
+    next batch.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    if state is None:
+        r0, p0 = accel_angles(ax[0], ay[0], az[0])
+        state = (float(r0), float(p0), 0.0, float(t[0]))
+    dt = np.diff(t, prepend=state[3])
+    gaps = np.flatnonzero(_is_gap(dt))
+    dt[gaps] = 0.0
+
+    acc_roll, acc_pitch = accel_angles(ax, ay, az)
+    g = np.radians(np.stack([gx, gy, gz])) * dt
+    u_roll = alpha * g[0] + (1 - alpha) * acc_roll
+    u_pitch = alpha * g[1] + (1 - alpha) * acc_pitch
+
+    # Solve each gap-free segment separately, seeding it from accel
+    roll, pitch = np.empty_like(u_roll), np.empty_like(u_pitch)
+    starts = [0, *gaps[gaps > 0]]
+    for s, e in zip(starts, [*starts[1:], t.size]):
+        if s in gaps:
+            r0, p0 = acc_roll[s], acc_pitch[s]
+        else:
+            r0, p0 = state[0], state[1]
+        roll[s:e] = _iir(u_roll[s:e], alpha, r0)
+        pitch[s:e] = _iir(u_pitch[s:e], alpha, p0)
+    yaw = state[2] + np.cumsum(g[2])
+    return roll, pitch, yaw, (float(roll[-1]), float(pitch[-1]), float(yaw[-1]), float(t[-1]))
+
+
+def add_orientation(df: pl.DataFrame, alpha=ALPHA, state=None):
+    """
+    Append roll/pitch/yaw (deg) and quaternion columns to a logged chunk.
+
+    Returns (df, state); pass `state` into the next chunk's call.
+    """
+    if df.is_empty():
+        return df, state
+    cols = [df[c].cast(pl.Float64).to_numpy() for c in
+            ("accel_x", "accel_y", "accel_z", "gyro_x", "gyro_y", "gyro_z")]
+    t = df.select(epoch_seconds(df)).to_series().to_numpy()
+    roll, pitch, yaw, state = complementary_batch(t, *cols, alpha=alpha, state=state)
+    qw, qx, qy, qz = euler_to_quaternion(roll, pitch, yaw)
+    return df.with_columns(
+        pl.Series("roll", np.degrees(roll)),
+        pl.Series("pitch", np.degrees(pitch)),
+        pl.Series("yaw", np.degrees(yaw)),
+        pl.Series("q_w", qw),
+        pl.Series("q_x", qx),
+        pl.Series("q_y", qy),
+        pl.Series("q_z", qz),
+    ), state
+
+
+def reprocess_files(files, alpha=ALPHA):
+    """Rewrite logged chunks in time order with orientation columns added."""
+    state = None
+    for f in sorted(files):
+        df = pl.read_parquet(f).drop(ORIENTATION_COLUMNS, strict=False)
+        df, state = add_orientation(df, alpha=alpha, state=state)
+        tmp = f + ".tmp"
+        df.write_parquet(tmp)
+        os.replace(tmp, f)
+    return state
+
+
+class ComplementaryFilter:
+    """Per-sample form of `complementary_batch` for the streaming path."""
+
+    def __init__(self, alpha=ALPHA):
+        self.alpha = alpha
+        self.roll = self.pitch = self.yaw = None
+        self._t = None
+
+    def update(self, t, ax, ay, az, gx, gy, gz):
+        """Feed one sample; returns (roll, pitch, yaw) in degrees."""
+        acc_roll = math.atan2(ay, az)
+        acc_pitch = math.atan2(-ax, math.sqrt(ay * ay + az * az))
+        if self._t is None:
+            self.roll, self.pitch, self.yaw = acc_roll, acc_pitch, 0.0
+            dt = 0.0
+        else:
+            dt = t - self._t
+            if _is_gap(dt):
+                self.roll, self.pitch, dt = acc_roll, acc_pitch, 0.0
+        self._t = t
+
+        a = self.alpha
+        d = math.pi / 180.0 * dt
+        self.roll = a * (self.roll + gx * d) + (1 - a) * acc_roll
+        self.pitch = a * (self.pitch + gy * d) + (1 - a) * acc_pitch
+        self.yaw += gz * d
+        return math.degrees(self.roll), math.degrees(self.pitch), math.degrees(self.yaw)
+
+    def update_sample(self, sample, t):
+        """Convenience for MPU6050.read() dicts: adds roll/pitch/yaw keys."""
+        sample["roll"], sample["pitch"], sample["yaw"] = self.update(
+            t,
+            sample["accel_x"], sample["accel_y"], sample["accel_z"],
+            sample["gyro_x"], sample["gyro_y"], sample["gyro_z"],
+        )
+        return sample
+
+
+class Madgwick:
+    """
+    6-DoF Madgwick filter (gradient-descent accel correction of the
+    gyro-integrated quaternion). Per-sample, scalar math only.
+    """
+
+    def __init__(self, beta=0.1):
+        self.beta = beta
+        self.q = (1.0, 0.0, 0.0, 0.0)
+        self._t = None
+
+    def update(self, t, ax, ay, az, gx, gy, gz):
+        """Feed one sample; returns the quaternion (w, x, y, z)."""
+        first = self._t is None
+        dt = 0.0 if first else t - self._t
+        self._t = t
+        if first or _is_gap(dt):
+            # Seed tilt from gravity (like ComplementaryFilter), keep heading
+            roll, pitch = accel_angles(ax, ay, az)
+            self.q = tuple(float(v) for v in euler_to_quaternion(
+                roll, pitch, math.radians(self.euler()[2])))
+            dt = 0.0
+        q0, q1, q2, q3 = self.q
+        gx, gy, gz = math.radians(gx), math.radians(gy), math.radians(gz)
+
+        # Rate of change of quaternion from gyroscope
+        qd0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+        qd1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+        qd2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+        qd3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+
+        norm = math.sqrt(ax * ax + ay * ay + az * az)
+        if norm > 0.0:
+            ax, ay, az = ax / norm, ay / norm, az / norm
+            # Gradient of the objective (predicted vs measured gravity)
+            f0 = 2 * (q1 * q3 - q0 * q2) - ax
+            f1 = 2 * (q0 * q1 + q2 * q3) - ay
+            f2 = 2 * (0.5 - q1 * q1 - q2 * q2) - az
+            s0 = -2 * q2 * f0 + 2 * q1 * f1
+            s1 = 2 * q3 * f0 + 2 * q0 * f1 - 4 * q1 * f2
+            s2 = -2 * q0 * f0 + 2 * q3 * f1 - 4 * q2 * f2
+            s3 = 2 * q1 * f0 + 2 * q2 * f1
+            sn = math.sqrt(s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3)
+            if sn > 0.0:
+                b = self.beta / sn
+                qd0 -= b * s0
+                qd1 -= b * s1
+                qd2 -= b * s2
+                qd3 -= b * s3
+
+        q0 += qd0 * dt
+        q1 += qd1 * dt
+        q2 += qd2 * dt
+        q3 += qd3 * dt
+        n = math.sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        self.q = (q0 / n, q1 / n, q2 / n, q3 / n)
+        return self.q
+
+    def euler(self):
+        """Current (roll, pitch, yaw) in degrees."""
+        w, x, y, z = self.q
+        roll = math.atan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y))
+        pitch = math.asin(max(-1.0, min(1.0, 2 * (w * y - z * x))))
+        yaw = math.atan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+        return math.degrees(roll), math.degrees(pitch), math.degrees(yaw)
@@ -0,0 +1,158 @@
+"""
+Map-reduce aggregation over a directory of Parquet chunks.
+
+With thousands of small chunk files the cost is per-file open/decode, not
+the aggregation itself, so files are split into batches and each batch is
+reduced to mergeable partials (see rollups.partials) in a worker process.
+The parent only concatenates and merges the small partial frames.
+
+`sketch_files` / `percentiles_dir` do the same with per-channel t-digests
+and histograms (see sketches.py) for quantiles over raw chunks.
+"""
+
+import glob
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import polars as pl
+
+from src.pipelines.rollups import finalize, merge_partials, partials
+from src.pipelines.schema import CHANNELS
+from src.pipelines.sketches import COMPRESSION, HIST_RANGES, Histogram, TDigest
+
+FILES_PER_TASK = 64  # batch size handed to each worker call
+
+
+def _map_files(files, width, channels):
+    """Worker: read a batch of chunks and reduce it to partial aggregates."""
+    out = []
+    for f in files:
+        try:
+            out.append(partials(pl.read_parquet(f), width, channels))
+        except Exception as e:
+            print(f"[WARN] Could not read {f}: {e}")
+    if not out:
+        return None
+    return merge_partials(pl.concat(out, how="diagonal"))
+
+
+def _map_sketches(files, channels, compression):
+    """Worker: per-channel (TDigest, Histogram) over a batch of chunks."""
+    out = {}
+    for f in files:
+        try:
+            df = pl.read_parquet(f)
+        except Exception as e:
+            print(f"[WARN] Could not read {f}: {e}")
+            continue
+        for c in channels:
+            if c not in df.columns:
+                continue
+            values = df[c].cast(pl.Float64).to_numpy()
+            if c not in out:
+                lo, hi = HIST_RANGES.get(c, (-1.0, 1.0))
+                out[c] = (TDigest(compression), Histogram(lo, hi))
+            out[c][0].update(values)
+            out[c][1].update(values)
+    return out
+
+
+def _batches(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _pool_map(fn, batches, args, workers):
+    """fn(batch, *args) for every batch, in-process or on a spawn pool."""
+    if workers == 1:
+        return [fn(b, *args) for b in batches]
+
+    # Each worker is single-threaded: parallelism comes from processes,
+    # and Polars' own thread pool would otherwise oversubscribe the cores.
+    # "spawn" because forking a process that already runs Polars threads
+    # can deadlock; children inherit the env var at start-up.
+    prev = os.environ.get("POLARS_MAX_THREADS")
+    os.environ["POLARS_MAX_THREADS"] = "1"
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp.get_context("spawn")
+        ) as pool:
+            n = len(batches)
+            return list(pool.map(fn, batches, *([a] * n for a in args)))
+    finally:
+        if prev is None:
+            os.environ.pop("POLARS_MAX_THREADS", None)
+        else:
+            os.environ["POLARS_MAX_THREADS"] = prev
+
+
+def aggregate_files(
+    files,
+    width=1,
+    workers=None,
+    channels=CHANNELS,
+    files_per_task=FILES_PER_TASK,
+):
+    """
+    Partial aggregates per `width`-second bucket across `files`.
+
+    workers=None uses every core; workers=1 runs in-process (no pool), which
+    is the baseline for the scaling benchmark.
+    """
+    batches = _batches(sorted(files), files_per_task)
+    workers = workers or os.cpu_count() or 1
+
+    parts = _pool_map(_map_files, batches, (width, channels), workers)
+    parts = [p for p in parts if p is not None]
+    if not parts:
+        return pl.DataFrame()
+    return merge_partials(pl.concat(parts, how="diagonal"))
+
+
+def aggregate_dir(directory="data/parquet", width=1, workers=None, channels=CHANNELS):
+    """mean/min/max/std/count per `width`-second bucket over a chunk directory."""
+    files = glob.glob(os.path.join(directory, "*.parquet"))
+    df = aggregate_files(files, width=width, workers=workers, channels=channels)
+    return df if df.is_empty() else finalize(df)
+
+
+def summarize_dir(directory="data/parquet", workers=None, channels=CHANNELS):
+    """Single-row totals (whole history) per channel."""
+    files = glob.glob(os.path.join(directory, "*.parquet"))
+    df = aggregate_files(files, width=3600, workers=workers, channels=channels)
+    if df.is_empty():
+        return df
+    return finalize(merge_partials(df.with_columns(pl.lit(0, pl.Int64).alias("bucket"))))
+
+
+def sketch_files(
+    files,
+    workers=None,
+    channels=CHANNELS,
+    compression=COMPRESSION,
+    files_per_task=FILES_PER_TASK,
+):
+    """channel -> (TDigest, Histogram) merged across `files`."""
+    batches = _batches(sorted(files), files_per_task)
+    workers = workers or os.cpu_count() or 1
+    merged = {}
+    for part in _pool_map(_map_sketches, batches, (channels, compression), workers):
+        for c, (td, hist) in part.items():
+            if c in merged:
+                merged[c][0].merge(td)
+                merged[c][1].merge(hist)
+            else:
+                merged[c] = (td, hist)
+    return merged
+
+
+def percentiles_dir(directory="data/parquet", qs=(0.5, 0.99), workers=None, channels=CHANNELS):
+    """Approximate percentiles per channel over a whole chunk directory."""
+    files = glob.glob(os.path.join(directory, "*.parquet"))
+    rows = []
+    for c, (td, _) in sketch_files(files, workers=workers, channels=channels).items():
+        row = {"channel": c, "count": td.count}
+        for q, v in zip(qs, td.quantile(list(qs))):
+            row[f"p{q * 100:g}"] = float(v)
+        rows.append(row)
+    return pl.DataFrame(rows)
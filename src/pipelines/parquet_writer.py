@@ -1,15 +1,54 @@
 import os
+import re
+import time
 import polars as pl
 from datetime import datetime
 
+from src import metrics
+
+
+def _hook_metric(hook):
+    """hook_<name>_seconds, e.g. RollupStore.on_chunk -> hook_rollupstore_on_chunk_seconds"""
+    name = getattr(hook, "__qualname__", type(hook).__name__)
+    return "hook_" + re.sub(r"\W+", "_", name).strip("_").lower() + "_seconds"
+
+
 class ParquetWriter:
-    def __init__(self, output_dir="data/parquet", chunk_size=200):
+    def __init__(self, output_dir="data/parquet", chunk_size=200, hooks=None,
+                 compression="zstd", verbose=False):
         self.output_dir = output_dir
         self.chunk_size = chunk_size
+        self.compression = compression
+        # Per-chunk log line; off by default, rows_written_total covers it
+        self.verbose = verbose
+        # Called as hook(df, path) after every closed chunk
+        self.hooks = list(hooks or [])
         os.makedirs(output_dir, exist_ok=True)
+        # Times only the Parquet write itself; hooks get their own histograms
+        self._write_timer = metrics.timer("write_chunk")
 
     def write_chunk(self, df: pl.DataFrame):
         fname = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f") + ".parquet"
         path = os.path.join(self.output_dir, fname)
-        df.write_parquet(path)
-        print(f"▶ Saved chunk: {path}")
+        # write-then-rename: the shipper and other readers glob *.parquet
+        # and must never pick up a half-written chunk
+        tmp = path + ".tmp"
+        with self._write_timer:
+            df.write_parquet(tmp, compression=self.compression)
+            os.replace(tmp, path)
+        metrics.counter("rows_written_total").inc(df.height)
+        if self.verbose:
+            print(f"▶ Saved chunk: {path}")
+
+        # Hooks feed derived stores (rollups, sketches, hot tier, shipper);
+        # a failing one must not stop raw logging or the hooks after it.
+        for hook in self.hooks:
+            t0 = time.perf_counter()
+            try:
+                hook(df, path)
+            except Exception as e:
+                metrics.counter("hook_errors_total").inc()
+                print(f"[WARN] Hook {getattr(hook, '__qualname__', hook)} failed on {path}: {e}")
+            finally:
+                metrics.histogram(_hook_metric(hook)).observe(time.perf_counter() - t0)
+        return path
@@ -0,0 +1,174 @@
+"""
+Materialized rollup tiers (1 s / 1 min / 1 h) for the sensor log.
+
+Every closed chunk is reduced to mergeable partial aggregates
+(count, sum, sum of squares, min, max per channel) and folded into small
+per-tier Parquet partitions:
+
+    data/rollups/1s/YYYYMMDD_HH.parquet   (<= 3600 rows)
+    data/rollups/1m/YYYYMMDD.parquet      (<= 1440 rows)
+    data/rollups/1h/YYYYMM.parquet        (<= 744 rows)
+
+Buckets that straddle two chunks are merged on write, so each partition holds
+exactly one row per bucket. mean/std are derived from the partials at query
+time, which keeps re-bucketing (e.g. 1 s -> 10 s) exact.
+"""
+
+import glob
+import os
+from datetime import datetime, timezone
+
+import polars as pl
+
+from src.pipelines.schema import CHANNELS, epoch_seconds, to_epoch
+
+# tier name -> bucket width (s), ordered finest to coarsest
+TIERS = {"1s": 1, "1m": 60, "1h": 3600}
+
+# tier name -> strftime pattern of the partition file it lands in
+PARTITION_FMT = {"1s": "%Y%m%d_%H", "1m": "%Y%m%d", "1h": "%Y%m"}
+
+
+def pick_tier(resolution_s):
+    """Coarsest tier whose bucket width evenly divides `resolution_s`."""
+    best = "1s"
+    for tier, width in TIERS.items():
+        if width <= resolution_s and resolution_s % width == 0:
+            best = tier
+    return best
+
+
+def _partial_aggs(channels):
+    aggs = []
+    for c in channels:
+        aggs += [
+            pl.col(c).sum().alias(f"{c}_sum"),
+            pl.col(c).pow(2).sum().alias(f"{c}_sumsq"),
+            pl.col(c).min().alias(f"{c}_min"),
+            pl.col(c).max().alias(f"{c}_max"),
+        ]
+    return aggs
+
+
+def _merge_aggs(channels):
+    aggs = [pl.col("count").sum()]
+    for c in channels:
+        aggs += [
+            pl.col(f"{c}_sum").sum(),
+            pl.col(f"{c}_sumsq").sum(),
+            pl.col(f"{c}_min").min(),
+            pl.col(f"{c}_max").max(),
+        ]
+    return aggs
+
+
+def partials(df: pl.DataFrame, width, channels=CHANNELS):
+    """Reduce raw rows to one partial-aggregate row per `width`-second bucket."""
+    channels = [c for c in channels if c in df.columns]
+    return (
+        df
+        .select([epoch_seconds(df).alias("t"), *channels])
+        .group_by(((pl.col("t") // width).cast(pl.Int64) * width).alias("bucket"))
+        .agg([pl.col("t").count().alias("count"), *_partial_aggs(channels)])
+    )
+
+
+def merge_partials(df: pl.DataFrame, width=None):
+    """Merge partial rows sharing a bucket, optionally re-bucketing to `width`."""
+    channels = [c[: -len("_sum")] for c in df.columns if c.endswith("_sum")]
+    key = pl.col("bucket")
+    if width is not None:
+        key = (key // width) * width
+    return df.group_by(key.alias("bucket")).agg(_merge_aggs(channels)).sort("bucket")
+
+
+def finalize(df: pl.DataFrame):
+    """Turn partials into mean/min/max/std/count columns per channel."""
+    channels = [c[: -len("_sum")] for c in df.columns if c.endswith("_sum")]
+    n = pl.col("count")
+    cols = [pl.col("bucket"), pl.from_epoch("bucket").alias("time"), n]
+    for c in channels:
+        s, ss = pl.col(f"{c}_sum"), pl.col(f"{c}_sumsq")
+        var = ((ss - s * s / n) / (n - 1)).clip(lower_bound=0.0)
+        cols += [
+            (s / n).alias(f"{c}_mean"),
+            pl.col(f"{c}_min").alias(f"{c}_min"),
+            pl.col(f"{c}_max").alias(f"{c}_max"),
+            pl.when(n > 1).then(var.sqrt()).otherwise(None).alias(f"{c}_std"),
+        ]
+    return df.select(cols)
+
+
+class RollupStore:
+    def __init__(self, root="data/rollups", channels=CHANNELS):
+        self.root = root
+        self.channels = tuple(channels)
+        for tier in TIERS:
+            os.makedirs(os.path.join(root, tier), exist_ok=True)
+
+    # -- ingest ---------------------------------------------------------
+    def on_chunk(self, df: pl.DataFrame, path=None):
+        """ParquetWriter hook: fold a freshly closed chunk into every tier."""
+        self.update(df)
+
+    def update(self, df: pl.DataFrame):
+        if df.is_empty():
+            return
+        for tier, width in TIERS.items():
+            self._fold(tier, partials(df, width, self.channels))
+
+    def backfill(self, raw_dir="data/parquet"):
+        """
+        Rebuild every tier from scratch out of the raw chunks.
+
+        Existing partitions are deleted first: update() adds into them, so
+        folding chunks the logger already rolled up would count them twice.
+        Don't run this while logger_v2 is writing to the same store.
+        """
+        for tier in TIERS:
+            for f in glob.glob(os.path.join(self.root, tier, "*.parquet")):
+                os.remove(f)
+        files = sorted(glob.glob(os.path.join(raw_dir, "*.parquet")))
+        for f in files:
+            self.update(pl.read_parquet(f))
+        print(f"[INFO] Rolled up {len(files)} chunk(s) into {self.root}")
+
+    def _fold(self, tier, partial: pl.DataFrame):
+        partial = partial.with_columns(
+            pl.from_epoch("bucket").dt.strftime(PARTITION_FMT[tier]).alias("partition")
+        )
+        for name in partial["partition"].unique().to_list():
+            new = partial.filter(pl.col("partition") == name).drop("partition")
+            path = os.path.join(self.root, tier, f"{name}.parquet")
+            if os.path.exists(path):
+                new = pl.concat([pl.read_parquet(path), new], how="diagonal")
+            # write-then-rename so concurrent readers never see a torn file
+            tmp = path + ".tmp"
+            merge_partials(new).write_parquet(tmp)
+            os.replace(tmp, path)
+
+    # -- query ----------------------------------------------------------
+    def query(self, start, end, resolution_s=1):
+        """
+        Aggregates for [start, end) at `resolution_s` second buckets.
+
+        `start`/`end` are epoch seconds or (UTC) datetimes. Reads only the
+        coarsest tier that can express the requested resolution.
+        """
+        tier = pick_tier(resolution_s)
+        start, end = to_epoch(start), to_epoch(end)
+        fmt = PARTITION_FMT[tier]
+        first = datetime.fromtimestamp(start, timezone.utc).strftime(fmt)
+        last = datetime.fromtimestamp(end, timezone.utc).strftime(fmt)
+
+        files = [
+            f for f in sorted(glob.glob(os.path.join(self.root, tier, "*.parquet")))
+            if first <= os.path.basename(f)[: -len(".parquet")] <= last
+        ]
+        if not files:
+            return pl.DataFrame()
+
+        lo = int(start // resolution_s) * resolution_s
+        df = pl.concat([pl.read_parquet(f) for f in files], how="diagonal")
+        df = df.filter((pl.col("bucket") >= lo) & (pl.col("bucket") < end))
+        return finalize(merge_partials(df, resolution_s))
@@ -0,0 +1,241 @@
+"""
+asyncio pipeline runtime: sources -> stages -> sinks in one process.
+
+    pipe = Pipeline()
+    rows = pipe.source("imu", sensor.read, rate_hz=20, blocking=True)
+    chunks = pipe.stage("batch", Batcher(200), rows)
+    pipe.sink("parquet", writer.write_chunk, chunks, blocking=True)
+    pipe.sink("dash", ring.append, rows, overflow="drop")
+    asyncio.run(pipe.run())
+
+- every edge is a bounded asyncio.Queue; an upstream node fans out to all
+  of its consumers
+- overflow="block" (default) applies backpressure to the producer;
+  overflow="drop" discards the oldest item instead, for consumers such as
+  dashboards that only care about recent data
+- blocking=True runs the function in a thread pool (I²C reads, Parquet
+  I/O) so the event loop never stalls
+- a stage returning None emits nothing (filters, batchers); objects with a
+  `flush()` method get it called on shutdown and the result is forwarded
+- stop() (also bound to SIGINT/SIGTERM by run()) stops the sources; the
+  close marker then drains every queue in order, so nothing in flight is lost
+- stats() gives per-node items in/out, drops, busy time and throughput
+"""
+
+import asyncio
+import inspect
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+
+from src import metrics
+
+QUEUE_SIZE = 1_000
+EXECUTOR_WORKERS = 4
+
+_CLOSE = object()  # end-of-stream marker, never dropped
+
+
+class Batcher:
+    """Stage helper: collect dict rows into `size`-row DataFrames."""
+
+    def __init__(self, size=200):
+        self.size = size
+        self.rows = []
+
+    def __call__(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.size:
+            return self.flush()
+        return None
+
+    def flush(self):
+        if not self.rows:
+            return None
+        df, self.rows = pl.DataFrame(self.rows), []
+        return df
+
+
+class Node:
+    def __init__(self, pipeline, name, fn, blocking=False):
+        self.pipeline = pipeline
+        self.name = name
+        self.fn = fn
+        self.blocking = blocking
+        self.inbox = None
+        self.overflow = "block"
+        self.outputs = []  # downstream nodes
+
+        self.items_in = 0
+        self.items_out = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy_s = 0.0
+        self._counter = metrics.counter(f"stage_{name}_items_total")
+
+    async def _call(self, fn, *args):
+        """Run `fn`; a failure is logged and counted, and yields None."""
+        t0 = time.perf_counter()
+        try:
+            if self.blocking:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.pipeline.executor, fn, *args)
+            result = fn(*args)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        except Exception as e:
+            # one bad I²C read or chunk must not take the whole process down
+            self.errors += 1
+            print(f"[WARN] {self.name}: {e!r}")
+            return None
+        finally:
+            self.busy_s += time.perf_counter() - t0
+
+    async def emit(self, item):
+        self.items_out += 1
+        self._counter.inc()
+        for node in self.outputs:
+            await node._put(item)
+
+    async def _put(self, item):
+        if self.overflow == "drop" and item is not _CLOSE:
+            while self.inbox.full():
+                self.inbox.get_nowait()
+                self.dropped += 1
+            self.inbox.put_nowait(item)
+        else:
+            await self.inbox.put(item)
+
+    async def _close(self):
+        for node in self.outputs:
+            await node._put(_CLOSE)
+
+    async def run(self):
+        while True:
+            item = await self.inbox.get()
+            if item is _CLOSE:
+                break
+            self.items_in += 1
+            result = await self._call(self.fn, item)
+            if result is not None:
+                await self.emit(result)
+
+        flush = getattr(self.fn, "flush", None)
+        if flush is not None:
+            result = await self._call(flush)
+            if result is not None:
+                await self.emit(result)
+        await self._close()
+
+
+class Source(Node):
+    def __init__(self, pipeline, name, fn, rate_hz=None, blocking=False):
+        super().__init__(pipeline, name, fn, blocking)
+        self.rate_hz = rate_hz
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        period = 1.0 / self.rate_hz if self.rate_hz else 0.0
+        next_t = loop.time()
+        while not self.pipeline.stopping.is_set():
+            item = await self._call(self.fn)
+            if item is not None:
+                await self.emit(item)
+            if period:
+                # fixed schedule, so read latency doesn't drift the rate;
+                # after a stall, resync instead of bursting to catch up
+                next_t += period
+                now = loop.time()
+                if next_t < now - period:
+                    next_t = now
+                await asyncio.sleep(max(0.0, next_t - now))
+            else:
+                await asyncio.sleep(0)
+        await self._close()
+
+
+class Pipeline:
+    def __init__(self, queue_size=QUEUE_SIZE, executor_workers=EXECUTOR_WORKERS):
+        self.queue_size = queue_size
+        self.executor = ThreadPoolExecutor(max_workers=executor_workers)
+        self.nodes = []
+        self.stopping = None
+        self._started = None
+
+    def _add(self, node, upstream=None, overflow="block", queue_size=None):
+        if upstream is not None:
+            node.inbox = asyncio.Queue(maxsize=queue_size or self.queue_size)
+            node.overflow = overflow
+            upstream.outputs.append(node)
+        self.nodes.append(node)
+        return node
+
+    def source(self, name, fn, rate_hz=None, blocking=False):
+        """`fn()` is polled at `rate_hz` (or as fast as possible)."""
+        return self._add(Source(self, name, fn, rate_hz, blocking))
+
+    def stage(self, name, fn, upstream, blocking=False, overflow="block", queue_size=None):
+        """`fn(item)` -> item to forward, or None to forward nothing."""
+        return self._add(Node(self, name, fn, blocking), upstream, overflow, queue_size)
+
+    def sink(self, name, fn, upstream, blocking=False, overflow="block", queue_size=None):
+        """Like a stage, but its results are not forwarded anywhere."""
+        return self.stage(name, fn, upstream, blocking, overflow, queue_size)
+
+    def stop(self):
+        """Stop the sources; everything already queued is still processed."""
+        if self.stopping is not None:
+            self.stopping.set()
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            n.name: {
+                "items_in": n.items_in,
+                "items_out": n.items_out,
+                "dropped": n.dropped,
+                "errors": n.errors,
+                "queued": n.inbox.qsize() if n.inbox is not None else 0,
+                "busy_s": round(n.busy_s, 4),
+                # sources: produced per second; stages/sinks: consumed per second
+                "items_per_s": round(
+                    (n.items_out if n.inbox is None else n.items_in) / elapsed, 1
+                ) if elapsed else 0.0,
+            }
+            for n in self.nodes
+        }
+
+    async def _report(self, every_s):
+        while not self.stopping.is_set():
+            await asyncio.sleep(every_s)
+            for name, s in self.stats().items():
+                print(
+                    f"[STATS] {name:<12} in={s['items_in']:<8} out={s['items_out']:<8} "
+                    f"drop={s['dropped']:<6} q={s['queued']:<5} {s['items_per_s']:>8}/s "
+                    f"busy={s['busy_s']}s"
+                )
+
+    async def run(self, report_every_s=None):
+        """Run until stop() / SIGINT / SIGTERM and all queues have drained."""
+        self.stopping = asyncio.Event()
+        self._started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # not on the main thread / not supported on this platform
+
+        reporter = None
+        if report_every_s:
+            reporter = asyncio.create_task(self._report(report_every_s))
+        try:
+            await asyncio.gather(*(n.run() for n in self.nodes))
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+            self.executor.shutdown(wait=True)
+        return self.stats()
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+import polars as pl
+
+# Channel columns produced by MPU6050.read() (and generate_synthetic_csv)
+CHANNELS = (
+    "accel_x",
+    "accel_y",
+    "accel_z",
+    "gyro_x",
+    "gyro_y",
+    "gyro_z",
+    "temp_c",
+)
+
+
+def to_epoch(value) -> float:
+    """Epoch seconds from a number or a datetime (naive datetimes are UTC)."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+def epoch_seconds(df: pl.DataFrame) -> pl.Expr:
+    """
+    Expression for the `timestamp` column as float epoch seconds.
+
+    logger_v2 writes ISO strings, the synthetic benchmark CSV writes float
+    seconds, so both (and real Datetime columns) are accepted.
+    """
+    dtype = df.collect_schema()["timestamp"]
+    if dtype == pl.Utf8:
+        return pl.col("timestamp").str.to_datetime().dt.epoch("us") / 1e6
+    if dtype == pl.Datetime:
+        return pl.col("timestamp").dt.epoch("us") / 1e6
+    return pl.col("timestamp").cast(pl.Float64)
+
+
+def timestamp_datetime(df: pl.DataFrame) -> pl.Expr:
+    """Expression for the `timestamp` column as a microsecond Datetime."""
+    dtype = df.collect_schema()["timestamp"]
+    if dtype == pl.Utf8:
+        return pl.col("timestamp").str.to_datetime(time_unit="us")
+    if dtype == pl.Datetime:
+        return pl.col("timestamp").cast(pl.Datetime("us"))
+    return pl.from_epoch(
+        (pl.col("timestamp") * 1_000_000).cast(pl.Int64), time_unit="us"
+    )
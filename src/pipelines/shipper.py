@@ -0,0 +1,318 @@
+"""
+Batched telemetry uplink: edge shipper + central collector.
+
+Shipper (on each node)
+- tails closed chunks in the writer's output dir (ParquetWriter hook wakes
+  it up immediately; a poll covers restarts and missed wake-ups)
+- batches chunks, encodes them with src/pipelines/codec.py and POSTs them
+  over one persistent HTTP/1.1 connection
+- persists the last acknowledged chunk name, so it resumes where it left off
+- lossless "xor" encoding by default; mode="quant" is opt-in and rounds each
+  channel to codec.QUANT_SCALE (smaller, but lossy)
+- backpressure: one batch in flight at a time; while behind, batches grow
+  up to MAX_BATCH_ROWS to amortise round trips; errors and 503s from a busy
+  collector back off exponentially. Chunks stay on disk meanwhile, so the
+  sensor loop is never blocked by the link.
+- chunks that cannot be read, and batches the collector rejects as bad
+  payloads (400 / 413 / 422), are skipped with a [WARN] instead of retried
+  forever; they stay on disk. Any other non-200 (429, 404, 401, 5xx, ...)
+  keeps the offset and backs off, honouring Retry-After.
+
+Collector (central)
+- POST /ingest -> data/collector/node_id=<id>/date=<YYYY-MM-DD>/<batch>.parquet
+  (hive layout: pl.scan_parquet(..., hive_partitioning=True) gives the
+  partition columns back). Batches are named after their first chunk, so a
+  batch re-sent after a crash overwrites instead of duplicating.
+
+Run locally:
+    python -m src.pipelines.shipper collector 8600
+    python -m src.pipelines.shipper ship http://127.0.0.1:8600 my-node
+"""
+
+import glob
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import polars as pl
+
+from src import metrics
+from src.pipelines.codec import decode_frame, encode_frame
+
+MAX_BATCH_ROWS = 50_000
+MAX_BACKOFF_S = 30.0
+# Statuses meaning "this payload will never be accepted": skip the batch
+REJECT_STATUSES = (400, 413, 422)
+
+
+class CollectorError(RuntimeError):
+    """Non-200 reply the shipper should retry (after `retry_after` s, if set)."""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"collector returned {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None  # absent, or an HTTP date: use our own backoff
+
+
+# -----------------------------
+# Edge side
+# -----------------------------
+class Shipper:
+    def __init__(
+        self,
+        url,
+        node_id,
+        source_dir="data/parquet",
+        state_path="data/shipper_state.json",
+        mode="xor",
+        poll_s=5.0,
+        timeout_s=10.0,
+    ):
+        u = urlparse(url)
+        self.host, self.port = u.hostname, u.port or 80
+        self.node_id = node_id
+        self.source_dir = source_dir
+        self.state_path = state_path
+        self.mode = mode
+        self.poll_s = poll_s
+        self.timeout_s = timeout_s
+
+        self.last_chunk = self._load_state()
+        self._conn = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.rows_shipped = metrics.counter("shipper_rows_total")
+        self.bytes_shipped = metrics.counter("shipper_bytes_total")
+        self.failures = metrics.counter("shipper_failures_total")
+        self.skipped = metrics.counter("shipper_chunks_skipped_total")
+
+    # -- offset ----------------------------------------------------------
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)["last_chunk"]
+        except (FileNotFoundError, KeyError, ValueError):
+            return ""
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"last_chunk": self.last_chunk}, f)
+        os.replace(tmp, self.state_path)
+
+    # -- connection ------------------------------------------------------
+    def _post(self, body, batch_id):
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout_s)
+        try:
+            self._conn.request("POST", "/ingest", body=body, headers={
+                "Content-Type": "application/octet-stream",
+                "X-Node-Id": self.node_id,
+                "X-Batch-Id": batch_id,
+            })
+            resp = self._conn.getresponse()
+            resp.read()
+            return resp.status, _retry_after(resp.getheader("Retry-After"))
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            self._conn = None
+            raise
+
+    # -- shipping --------------------------------------------------------
+    def pending(self):
+        """Closed chunks not yet acknowledged by the collector, oldest first."""
+        files = sorted(glob.glob(os.path.join(self.source_dir, "*.parquet")))
+        return [f for f in files if os.path.basename(f) > self.last_chunk]
+
+    def _advance(self, used):
+        self.last_chunk = os.path.basename(used[-1])
+        self._save_state()
+
+    def ship_batch(self, files):
+        """
+        Send one batch; returns rows shipped. Raises on transport errors and
+        retryable statuses (CollectorError); unreadable chunks and batches
+        rejected with REJECT_STATUSES are skipped.
+        """
+        frames, rows, used = [], 0, []
+        for f in files:
+            used.append(f)
+            try:
+                df = pl.read_parquet(f)
+            except Exception as e:
+                self.skipped.inc()
+                print(f"[WARN] Skipping unreadable chunk {f}: {e}")
+                continue
+            frames.append(df)
+            rows += df.height
+            if rows >= MAX_BATCH_ROWS:
+                break
+        if not frames:
+            self._advance(used)
+            return 0
+
+        df = pl.concat(frames, how="diagonal_relaxed")
+        df = df.select([c for c in df.columns if c == "timestamp" or df[c].dtype.is_numeric()])
+        body = encode_frame(df, mode=self.mode)
+
+        status, retry_after = self._post(body, os.path.basename(used[0]))
+        if status in REJECT_STATUSES:
+            # Resending the same bytes cannot succeed; don't block the queue
+            self.skipped.inc(len(frames))
+            print(f"[WARN] Collector rejected {used[0]}..{used[-1]} ({status}); skipping")
+            self._advance(used)
+            return 0
+        if status != 200:
+            raise CollectorError(status, retry_after)
+
+        self._advance(used)
+        self.rows_shipped.inc(rows)
+        self.bytes_shipped.inc(len(body))
+        return rows
+
+    def drain(self):
+        """Ship until caught up (no retry); returns rows shipped."""
+        total = 0
+        while True:
+            files = self.pending()
+            if not files:
+                return total
+            total += self.ship_batch(files)
+
+    def on_chunk(self, df, path):
+        """ParquetWriter hook: wake the shipper thread."""
+        self._wake.set()
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            files = self.pending()
+            if not files:
+                self._wake.wait(self.poll_s)
+                self._wake.clear()
+                continue
+            try:
+                self.ship_batch(files)
+                backoff = 1.0
+            except Exception as e:
+                self.failures.inc()
+                wait = backoff
+                if isinstance(e, CollectorError) and e.retry_after is not None:
+                    wait = e.retry_after
+                print(f"[WARN] Shipping failed ({e}); retrying in {wait:.0f}s")
+                self._stop.wait(wait)
+                backoff = min(backoff * 2, MAX_BACKOFF_S)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._conn is not None:
+            self._conn.close()
+
+
+# -----------------------------
+# Collector side
+# -----------------------------
+class _IngestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive for the shippers' connections
+
+    def do_POST(self):
+        # Always consume the body: on a keep-alive connection unread bytes
+        # would be parsed as the next request.
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != "/ingest":
+            self._reply(404)
+            return
+        node_id = self.headers.get("X-Node-Id", "")
+        batch_id = self.headers.get("X-Batch-Id", "")
+        if not node_id or "/" in node_id or not batch_id or "/" in batch_id:
+            self._reply(400)
+            return
+
+        # Bounded concurrent writes: a busy collector answers 503 and the
+        # shipper backs off instead of piling up threads here.
+        if not self.server.slots.acquire(blocking=False):
+            self._reply(503)
+            return
+        try:
+            rows = self.server.collector.ingest(node_id, batch_id, decode_frame(body))
+        except (ValueError, pl.exceptions.PolarsError):
+            self._reply(400)
+            return
+        finally:
+            self.server.slots.release()
+        self._reply(200, json.dumps({"rows": rows}).encode())
+
+    def _reply(self, status, body=b""):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Collector:
+    def __init__(self, root="data/collector", max_concurrent=4):
+        self.root = root
+        self.max_concurrent = max_concurrent
+        self.rows = metrics.counter("collector_rows_total")
+        os.makedirs(root, exist_ok=True)
+
+    def ingest(self, node_id, batch_id, df: pl.DataFrame):
+        """Write a decoded batch into node_id=/date= partitions."""
+        df = df.with_columns(pl.col("timestamp").dt.date().alias("_date"))
+        for day in df["_date"].unique().to_list():
+            part = os.path.join(self.root, f"node_id={node_id}", f"date={day}")
+            os.makedirs(part, exist_ok=True)
+            out = os.path.join(part, batch_id)
+            tmp = out + ".tmp"
+            df.filter(pl.col("_date") == day).drop("_date").write_parquet(tmp)
+            os.replace(tmp, out)
+        self.rows.inc(df.height)
+        return df.height
+
+    def serve(self, port=8600, host="0.0.0.0"):
+        server = ThreadingHTTPServer((host, port), _IngestHandler)
+        server.collector = self
+        server.slots = threading.BoundedSemaphore(self.max_concurrent)
+        print(f"[INFO] Collector listening on {host}:{port}, writing to {self.root}")
+        return server
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "collector":
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else 8600
+        Collector().serve(port=port).serve_forever()
+    elif len(sys.argv) >= 4 and sys.argv[1] == "ship":
+        shipper = Shipper(sys.argv[2], sys.argv[3]).start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            shipper.stop()
+    else:
+        print(__doc__)
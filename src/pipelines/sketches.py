@@ -0,0 +1,210 @@
+"""
+Mergeable per-channel quantile sketches and fixed-bin histograms.
+
+Each closed chunk gets one sketch row per channel (t-digest centroids +
+histogram counts + exact min/max/count) in data/sketches/, named after the
+chunk. Percentiles for any time range are answered by merging those rows,
+without touching raw data. Time resolution is one chunk (10 s at 20 Hz).
+"""
+
+import glob
+import math
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import polars as pl
+
+from src.pipelines.schema import CHANNELS, epoch_seconds, to_epoch
+
+COMPRESSION = 100  # t-digest delta: ~COMPRESSION/2 centroids per sketch
+HIST_BINS = 64
+
+# Fixed histogram ranges so histograms from any chunk/node are mergeable.
+# Out-of-range values are clamped into the first/last bin.
+HIST_RANGES = {
+    "accel_x": (-20.0, 20.0),   # m/s², MPU6050 ±2 g
+    "accel_y": (-20.0, 20.0),
+    "accel_z": (-20.0, 20.0),
+    "gyro_x": (-250.0, 250.0),  # °/s, MPU6050 ±250 °/s
+    "gyro_y": (-250.0, 250.0),
+    "gyro_z": (-250.0, 250.0),
+    "temp_c": (-40.0, 85.0),
+}
+
+
+class TDigest:
+    """
+    Merging t-digest with vectorized (NumPy) compression.
+
+    Centroids are regrouped by floor(k(q)) with the arcsine scale function,
+    which keeps tail centroids small so p1/p99 stay accurate.
+    """
+
+    def __init__(self, compression=COMPRESSION, means=None, weights=None,
+                 vmin=math.inf, vmax=-math.inf):
+        self.compression = compression
+        self.means = np.asarray(means if means is not None else [], dtype=np.float64)
+        self.weights = np.asarray(weights if weights is not None else [], dtype=np.float64)
+        self.min = vmin
+        self.max = vmax
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.means = np.concatenate([self.means, values])
+        self.weights = np.concatenate([self.weights, np.ones(values.size)])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.means = np.concatenate([self.means, other.means])
+        self.weights = np.concatenate([self.weights, other.weights])
+        self._compress()
+        return self
+
+    def _compress(self):
+        order = np.argsort(self.means, kind="stable")
+        m, w = self.means[order], self.weights[order]
+        if m.size <= self.compression:
+            self.means, self.weights = m, w
+            return
+        total = w.sum()
+        q = (np.cumsum(w) - w / 2) / total
+        k = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(w, starts)
+        self.means = np.add.reduceat(m * w, starts) / self.weights
+
+    def quantile(self, q):
+        """Estimate quantile(s) `q` in [0, 1]; NaN if the digest is empty."""
+        if self.means.size == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else math.nan
+        total = self.weights.sum()
+        mids = np.cumsum(self.weights) - self.weights / 2
+        xs = np.r_[0.0, mids, total]
+        ys = np.r_[self.min, self.means, self.max]
+        return np.interp(np.asarray(q) * total, xs, ys)
+
+
+class Histogram:
+    """Fixed-edge histogram; merge is a vector add."""
+
+    def __init__(self, lo, hi, bins=HIST_BINS, counts=None):
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.counts = (
+            np.zeros(bins, dtype=np.int64) if counts is None
+            else np.asarray(counts, dtype=np.int64)
+        )
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        idx = np.searchsorted(self.edges, values, side="right") - 1
+        idx = np.clip(idx, 0, self.counts.size - 1)
+        self.counts += np.bincount(idx, minlength=self.counts.size)
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+
+def sketch_chunk(df: pl.DataFrame, channels=CHANNELS, compression=COMPRESSION):
+    """One sketch row per channel for a chunk (list columns for centroids/bins)."""
+    t = df.select(epoch_seconds(df)).to_series()
+    start, end = float(t.min()), float(t.max())
+
+    rows = []
+    for c in channels:
+        if c not in df.columns:
+            continue
+        values = df[c].cast(pl.Float64).to_numpy()
+        td = TDigest(compression).update(values)
+        lo, hi = HIST_RANGES.get(c, (-1.0, 1.0))
+        hist = Histogram(lo, hi).update(values)
+        rows.append({
+            "channel": c,
+            "start": start,
+            "end": end,
+            "count": td.count,
+            "min": td.min,
+            "max": td.max,
+            "means": td.means.tolist(),
+            "weights": td.weights.tolist(),
+            "hist": hist.counts.tolist(),
+        })
+    return pl.DataFrame(rows)
+
+
+class SketchStore:
+    def __init__(self, root="data/sketches", channels=CHANNELS, compression=COMPRESSION):
+        self.root = root
+        self.channels = tuple(channels)
+        self.compression = compression
+        os.makedirs(root, exist_ok=True)
+
+    def on_chunk(self, df: pl.DataFrame, path):
+        """ParquetWriter hook: store the chunk's sketches next to its name."""
+        if df.is_empty():
+            return
+        out = os.path.join(self.root, os.path.basename(path))
+        sketch_chunk(df, self.channels, self.compression).write_parquet(out)
+
+    def load(self, start, end):
+        """Sketch rows overlapping [start, end] (epoch seconds or UTC datetimes)."""
+        start, end = to_epoch(start), to_epoch(end)
+        # Chunk names are their UTC close time, so anything named before
+        # `start` ended before it; the first file after `end` may still overlap.
+        first = datetime.fromtimestamp(start, timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+        last = datetime.fromtimestamp(end, timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+        files = []
+        for f in sorted(glob.glob(os.path.join(self.root, "*.parquet"))):
+            name = os.path.basename(f)
+            if name < first:
+                continue
+            files.append(f)
+            if name > last:
+                break
+        if not files:
+            return pl.DataFrame()
+        df = pl.concat([pl.read_parquet(f) for f in files], how="vertical_relaxed")
+        return df.filter((pl.col("end") >= start) & (pl.col("start") <= end))
+
+    def merged(self, start, end, channels=None):
+        """channel -> (TDigest, Histogram) merged over [start, end]."""
+        df = self.load(start, end)
+        out = {}
+        if df.is_empty():
+            return out
+        for c in channels or self.channels:
+            td = TDigest(self.compression)
+            lo, hi = HIST_RANGES.get(c, (-1.0, 1.0))
+            hist = Histogram(lo, hi)
+            for row in df.filter(pl.col("channel") == c).iter_rows(named=True):
+                td.merge(TDigest(self.compression, row["means"], row["weights"],
+                                 row["min"], row["max"]))
+                hist.merge(Histogram(lo, hi, counts=row["hist"]))
+            if td.count:
+                out[c] = (td, hist)
+        return out
+
+    def percentiles(self, start, end, qs=(0.5, 0.99), channels=None):
+        """DataFrame of percentiles per channel, e.g. columns p50 / p99."""
+        rows = []
+        for c, (td, _) in self.merged(start, end, channels).items():
+            row = {"channel": c, "count": td.count}
+            for q, v in zip(qs, td.quantile(np.asarray(qs))):
+                row[f"p{q * 100:g}"] = float(v)
+            rows.append(row)
+        return pl.DataFrame(rows)
@@ -1,9 +1,12 @@
 from mpu6050 import mpu6050
 
+from src import metrics
+
 class MPU6050:
     def __init__(self, address=0x68):
         self.sensor = mpu6050(address)
 
+    @metrics.timed("sensor_read", sample_every=10)
     def read(self):
         accel = self.sensor.get_accel_data()
         gyro  = self.sensor.get_gyro_data()